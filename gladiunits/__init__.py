@@ -7,10 +7,12 @@
     @author: z33k
 
 """
-from gladiunits.utils import init_log
+import logging
 
+from gladiunits.utils import init_log  # opt-in: call it to log to a file and the console
 
-init_log()
+# library etiquette: stay silent unless the application configures logging
+logging.getLogger(__name__).addHandler(logging.NullHandler())
 
 
 
@@ -0,0 +1,93 @@
+"""
+
+    gladiunits.cache.py
+    ~~~~~~~~~~~~~~~~~~~
+    Cache parsed data on disk.
+
+    @author: z33k
+
+    Parsing and dereferencing all the game XMLs is by far the slowest thing this project does,
+    yet its result only changes when the XMLs do. `load_all()` pickles the result of
+    `parse.parse_all()` into the output directory under a name derived from the XML tree's
+    state (number of files and their latest modification time) and the source of the modules
+    that define and build the pickled objects, and reads it back on subsequent runs as long as
+    neither has changed.
+
+    The XML half of that signature is cheap but approximate: an edit or a copy that preserves
+    timestamps (and the file count) goes unnoticed. Delete the cached file to force a re-parse
+    in such a case.
+
+"""
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+from gladiunits.constants import XML_DIR
+from gladiunits.data import Building, Trait, Unit, Upgrade, Weapon
+from gladiunits.utils import ensure_output_dir
+
+_log = logging.getLogger(__name__)
+
+CACHE_PREFIX = "parsed_"
+CACHE_SUFFIX = ".pickle"
+TMP_PREFIX = "tmp_"  # never a prefix of a (hexadecimal) signature, so swept like stale files
+
+# modules whose changes can alter the shape or content of what gets pickled
+CODE_MODULES = ("data.py", "dereference.py", "parse.py")
+
+Parsed = tuple[list[Upgrade], list[Trait], list[Weapon], list[Unit], list[Building]]
+
+
+def _signature(xml_dir: Path = XML_DIR) -> str:
+    count, latest = 0, 0
+    for dir_, _, files in os.walk(xml_dir):
+        for f in files:
+            count += 1
+            latest = max(latest, os.stat(os.path.join(dir_, f)).st_mtime_ns)
+    digest = hashlib.sha1(f"{count}:{latest}".encode())
+    package_dir = Path(__file__).parent
+    for module in CODE_MODULES:  # a pickle written by older code would load with fields missing
+        digest.update((package_dir / module).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def get_cache_file(signature: str, sort=False) -> Path:
+    sorted_ = "_sorted" if sort else ""
+    return ensure_output_dir() / f"{CACHE_PREFIX}{signature}{sorted_}{CACHE_SUFFIX}"
+
+
+def load_all(sort=False) -> Parsed:
+    """Return what `parse.parse_all()` would, reading it from the on-disk cache if possible.
+    """
+    signature = _signature()
+    file = get_cache_file(signature, sort=sort)
+    if file.is_file():
+        try:
+            with file.open("rb") as f:
+                parsed = pickle.load(f)
+            _log.info(f"Loaded parsed data from cache: '{file}'")
+            return parsed
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError) as e:
+            _log.warning(f"Ignoring unreadable cache file '{file}': {e}")
+
+    from gladiunits.parse import parse_all  # parses displayed texts on import
+    parsed = parse_all(sort=sort)
+    for stale in file.parent.glob(f"{CACHE_PREFIX}*{CACHE_SUFFIX}"):
+        # left by older XMLs/code or by a run killed mid-write
+        if not stale.name.startswith(f"{CACHE_PREFIX}{signature}"):
+            stale.unlink(missing_ok=True)
+    # written aside and moved into place so an interrupted run never leaves a truncated cache
+    fd, tmp = tempfile.mkstemp(
+        dir=file.parent, prefix=f"{CACHE_PREFIX}{TMP_PREFIX}", suffix=CACHE_SUFFIX)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(parsed, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, file)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    _log.info(f"Cached parsed data at: '{file}'")
+    return parsed
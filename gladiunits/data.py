@@ -6,15 +6,24 @@
 
     @author: z33k
 
+    Dereferencing swaps Origin-valued attributes (params' values, required upgrades, producers)
+    for the objects they point to in place, but never the tuples of traits, actions and weapons
+    nor the truthiness of anything their grouping looks at. Hence, those groupings are stored on
+    first access.
+
 """
-from collections import OrderedDict, defaultdict
+from __future__ import annotations
+
+import sys
+from collections import defaultdict
 from dataclasses import dataclass, field, fields, is_dataclass
 from enum import Enum, auto
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Any, ClassVar, Literal, Type, TypeAlias, Union
+from types import UnionType
+from typing import (Any, ClassVar, Literal, Type, TypeAlias, Union, get_args, get_origin,
+                    get_type_hints)
 
-from gladiunits.utils import from_iterable
 
 CATEGORIES = [
     'Actions',
@@ -59,7 +68,14 @@ FACTIONS = [
     'Tyranids',
 ]
 
-_CIRCULAR_REFS = {
+# for O(1) membership checks
+CATEGORIES_SET = frozenset(CATEGORIES)
+PARSED_CATEGORIES_SET = frozenset(PARSED_CATEGORIES)
+FACTIONS_SET = frozenset(FACTIONS)
+# singular lowercase forms (as used in effect names) paired with their categories
+_LOWER_CATEGORIES = tuple((cat[:-1].lower(), cat) for cat in CATEGORIES)
+
+_CIRCULAR_REFS = frozenset({
     "Units/ChaosSpaceMarines/MasterOfPossession",
     "Units/Eldar/FirePrism",
     "Units/Neutral/Artefacts/Damage",
@@ -90,7 +106,62 @@ _CIRCULAR_REFS = {
     'Buildings/SpaceMarines/Construction',
     'Buildings/Tau/Construction',
     'Buildings/Tyranids/Construction',
-}
+})
+
+
+def _parse_category(
+        parts: tuple[str, ...], stem: str, anchored: bool, has_faction: bool) -> str:
+    # parent, grandparent and great-grandparent directory names ('' past the top, just like
+    # `Path.parent.name`) read off the parts instead of walking `Path.parent`
+    names = parts[1:] if anchored else parts
+    parent, grandparent, great_grandparent = (
+        names[-k] if len(names) >= k else "" for k in (2, 3, 4))
+    # the faction scan has already been done, so the faction branches are only entered
+    # for paths that have one
+    if has_faction and parent in FACTIONS_SET:
+        category = grandparent
+    elif has_faction and grandparent in FACTIONS_SET:
+        category = great_grandparent
+    else:
+        category = parent
+        if category == "Artefacts":
+            if grandparent in CATEGORIES_SET:
+                category = grandparent
+            else:
+                category = great_grandparent
+        elif category == "Items" and grandparent == "Traits":
+            category = "Traits"
+        # handle edge cases like '<noCooldownAction name="SerpentShield/SerpentShield"/>'
+        # in Eldar/SerpentShield.xml
+        if category == stem:
+            idx = parts.index(category)
+            if idx > 0:
+                idx -= 1
+                category = parts[idx]
+    return category
+
+
+# the same handful of paths gets referenced over and over again by the parsed XMLs, so their
+# analysis is shared by all the Origins created for them
+@lru_cache(maxsize=None)
+def _analyze_path(
+        parts: tuple[str, ...], stem: str,
+        anchored: bool) -> tuple[str, str | None, Path, str, str, bool]:
+    faction = None
+    for part in parts:
+        if part in FACTIONS_SET:
+            faction = part
+            break
+    category = _parse_category(parts, stem, anchored, faction is not None)
+    if category not in CATEGORIES_SET:
+        raise ValueError(f"unknown category: {category!r}")
+    idx = parts.index(category)
+    category_path = Path(*parts[idx:-1], stem)
+    category_path_str = str(category_path)
+    is_unresolved_ref = (
+        category in PARSED_CATEGORIES_SET and category_path_str not in _CIRCULAR_REFS)
+    return (category, faction, category_path, category_path_str,
+            str(Path(*category_path.parts[1:])), is_unresolved_ref)
 
 
 @dataclass(frozen=True)
@@ -99,51 +170,43 @@ class Origin:
 
     @property
     def category(self) -> str:
-        parent = self.path.parent
-        if parent.name in FACTIONS:
-            category = parent.parent.name
-        elif parent.parent.name in FACTIONS:
-            category = parent.parent.parent.name
-        else:
-            category = parent.name
-            if category == "Artefacts":
-                if parent.parent.name in CATEGORIES:
-                    category = parent.parent.name
-                else:
-                    category = parent.parent.parent.name
-            elif category == "Items" and parent.parent.name == "Traits":
-                category = "Traits"
-            # handle edge cases like '<noCooldownAction name="SerpentShield/SerpentShield"/>'
-            # in Eldar/SerpentShield.xml
-            if category == self.path.stem:
-                idx = self.path.parts.index(category)
-                if idx > 0:
-                    idx -= 1
-                    category = self.path.parts[idx]
-        return category
+        return self._category
 
     @property
     def faction(self) -> str | None:
-        return from_iterable(self.path.parts, lambda p: p in FACTIONS)
+        return self._faction
 
     @property
     def category_path(self) -> Path:
-        idx = self.path.parts.index(self.category)
-        return Path(*self.path.parts[idx:-1], self.path.stem)
+        return self._category_path
 
     @property
     def stem(self) -> str:
-        return str(Path(*self.category_path.parts[1:]))
+        return self._stem
 
     def __post_init__(self) -> None:
-        if self.category not in CATEGORIES:
-            raise ValueError(f"unknown category: {self.category!r}")
+        # derived once as all the above are hit repeatedly during parsing and dereferencing
+        path_str = str(self.path)
+        # hashed by the path-hashed subclasses; str caches its own hash, so this is cheap and,
+        # unlike a stored int, never goes stale in a pickle loaded by another process
+        object.__setattr__(self, "_path_str", path_str)
+        parts = self.path.parts
+        object.__setattr__(self, "_parts", parts)
+        (category, faction, category_path, category_path_str, stem,
+         is_unresolved_ref) = _analyze_path(parts, self.path.stem, bool(self.path.anchor))
+        object.__setattr__(self, "_category", category)
+        object.__setattr__(self, "_faction", faction)
+        object.__setattr__(self, "_category_path", category_path)
+        object.__setattr__(self, "_category_path_str", category_path_str)
+        object.__setattr__(self, "_stem", stem)
+        # consulted by `is_unresolved_ref()` for plain Origins only
+        object.__setattr__(self, "_is_unresolved_ref", is_unresolved_ref)
 
     def __str__(self) -> str:
-        return str(self.path)
+        return self._path_str
 
     def matches(self, category_path: str) -> bool:
-        return str(self.category_path) == category_path
+        return self._category_path_str == category_path
 
 
 @dataclass(frozen=True)
@@ -171,174 +234,276 @@ class ReferenceMixin:
 
 def is_unresolved_ref(value: Any) -> bool:
     # needs an explicit type check
-    if type(value) is not Origin:
-        return False
-    if str(value.category_path) in _CIRCULAR_REFS:
+    return value.__class__ is Origin and value._is_unresolved_ref
+
+
+def _may_hold_refs(hint: Any) -> bool:
+    """Return ``True`` if a field annotated with ``hint`` can hold an Origin or a sequence.
+    """
+    if hint is Any:
+        return True
+    origin = get_origin(hint)
+    if origin is Union or origin is UnionType:
+        return any(_may_hold_refs(arg) for arg in get_args(hint))
+    if origin is Literal:
         return False
-    return value.category in PARSED_CATEGORIES
-
-
-# recursive
+    if origin is not None:  # e.g. tuple[Effect, ...]
+        hint = origin
+    if not isinstance(hint, type):
+        return True  # unknown, better safe than sorry
+    return hint in (tuple, list) or issubclass(hint, Origin) or issubclass(Origin, hint)
+
+
+@lru_cache(maxsize=None)
+def _ref_field_names(cls: type) -> tuple[str, ...]:
+    # 'reference' fields point at other top-level objects and are resolved on their own,
+    # fields typed as scalars, enums, paths and the like cannot hold anything worth visiting and
+    # non-init fields only cache what's derived from the others
+    try:
+        hints = get_type_hints(cls)
+    except (NameError, TypeError):
+        hints = {}
+    return tuple(
+        sys.intern(f.name) for f in fields(cls)
+        if f.init and f.name != "reference" and _may_hold_refs(hints.get(f.name, Any)))
+
+
+# recursive (all calls share one `crumbs` list that is joined only for the collected refs)
 def collect_unresolved_refs(
-        obj: Any, crumbs="",
+        obj: Any, crumbs: list[str] | None = None,
         collected: dict[str, Origin] = None) -> dict[str, Origin]:
-    crumbs = crumbs.split(".") if crumbs else []
-    collected = collected or {}
+    crumbs = [] if crumbs is None else crumbs
+    collected = {} if collected is None else collected
 
     if is_dataclass(obj):
-        for f in fields(obj):
-            if f.name == "reference":
-                continue
-            crumbs.append(f.name)
-            value = getattr(obj, f.name)
-
-            if isinstance(value, (tuple, list)):
+        for name in _ref_field_names(type(obj)):
+            crumbs.append(name)
+            value = getattr(obj, name)
+
+            # `is_unresolved_ref()` inlined below (this is the hottest loop of dereferencing) and
+            # exact class checks used throughout as the set of types involved is closed
+            value_type = value.__class__
+            if value_type is tuple or value_type is list:
                 for i, item in enumerate(value):
-                    crumbs.append(str(i))
-                    if is_unresolved_ref(item):
-                        collected[".".join(crumbs)] = item
-                    else:
-                        collected = collect_unresolved_refs(item, ".".join(crumbs), collected)
-                    # trim crumbs
-                    crumbs = crumbs[:-1]
-
-            elif is_unresolved_ref(value):
+                    item_type = item.__class__
+                    if item_type is Origin:  # nothing to recurse into for plain Origins
+                        if item._is_unresolved_ref:
+                            crumbs.append(str(i))
+                            collected[".".join(crumbs)] = item
+                            crumbs.pop()
+                    elif item_type is Parameter and item.value.__class__ in _SCALAR_TYPES:
+                        continue  # the bulk of parameters, nothing to recurse into either
+                    elif is_dataclass(item):
+                        crumbs.append(str(i))
+                        collect_unresolved_refs(item, crumbs, collected)
+                        # trim crumbs
+                        crumbs.pop()
+
+            elif value_type is Origin and value._is_unresolved_ref:
                 collected[".".join(crumbs)] = value
 
             # trim crumbs
-            crumbs = crumbs[:-1]
+            crumbs.pop()
 
     return collected
 
 
-@dataclass(frozen=True)
+# iterative (a short-circuiting version of the above for when only emptiness matters, with no
+# crumbs to keep track of, an explicit stack of objects yet to visit is all it needs)
+def has_unresolved_refs(obj: Any) -> bool:
+    if not is_dataclass(obj):
+        return False
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        for name in _ref_field_names(type(obj)):
+            value = getattr(obj, name)
+            value_type = value.__class__
+            if value_type is tuple or value_type is list:
+                for item in value:
+                    item_type = item.__class__
+                    if item_type is Origin:
+                        if item._is_unresolved_ref:
+                            return True
+                    elif item_type is Parameter and item.value.__class__ in _SCALAR_TYPES:
+                        continue
+                    elif is_dataclass(item):
+                        stack.append(item)
+            elif value_type is Origin and value._is_unresolved_ref:
+                return True
+    return False
+
+
+# classes of parameter values that can't hold references
+_SCALAR_TYPES = frozenset((float, int, bool, str))
+
+# module-level so that the per-instance validation skips the class attribute lookup
+_PARAM_TYPES: dict[str, Any] = {
+    'action': Origin,
+    'add': float,
+    'addMax': float,
+    'addMin': float,
+    'base': float,
+    'beginOnDisappear': bool,
+    'building': Origin,
+    'charges': int,
+    'consumedAction': bool,
+    'consumedActionPoints': bool,
+    'consumedMovement': bool,
+    'cooldown': int,
+    'cooldownMin': int,
+    'cooldownMax': int,
+    'cooldownRemaining': int,
+    'cooldownScalesWithPace': bool,
+    'costScalesWithPace': bool,
+    'count': int,
+    'countMax': int,
+    'disableable': bool,
+    'duration': int,
+    'durationMin': int,
+    'durationMax': int,
+    'elite': bool,
+    'enabled': bool,
+    'equal': float,
+    'feature': Origin,
+    'greater': float,
+    'interfaceSound': str,
+    'less': float,
+    'levelMin': int,
+    'levelMax': int,
+    'levelUpPriority': float,
+    'match': str,
+    'max': float,
+    'min': float,
+    'minMax': float,
+    'minMin': float,
+    'mul': float,
+    'mulMax': float,
+    'mulMin': float,
+    'name': Origin,
+    'passive': bool,
+    'psychicPower': bool,
+    'radius': int,
+    'rank': int,
+    'rankMax': int,
+    'range': int,
+    'reference': Origin,
+    'removeOnSourceDeath': bool,
+    'requiredActionPoints': bool,
+    'requiredMovement': bool,
+    'requiredUpgrade': Origin,
+    'shoutString': Origin,
+    'slotName': str,
+    'unit': Origin,
+    'unitType': Origin,
+    'usableInTransport': bool,
+    'visible': bool,
+    'weapon': Origin,
+    'weaponSlotName': Origin,
+    'weaponSlotNames': (tuple, Origin),
+}
+# validation only needs the names (interned, like the ones the parser passes in)
+_PARAM_TYPE_NAMES = frozenset(sys.intern(t) for t in _PARAM_TYPES)
+
+
+@dataclass(frozen=True, slots=True)
 class Parameter:
-    TYPES: ClassVar[dict[str, Any]] = {
-        'action': Origin,
-        'add': float,
-        'addMax': float,
-        'addMin': float,
-        'base': float,
-        'beginOnDisappear': bool,
-        'building': Origin,
-        'charges': int,
-        'consumedAction': bool,
-        'consumedActionPoints': bool,
-        'consumedMovement': bool,
-        'cooldown': int,
-        'cooldownMin': int,
-        'cooldownMax': int,
-        'cooldownRemaining': int,
-        'cooldownScalesWithPace': bool,
-        'costScalesWithPace': bool,
-        'count': int,
-        'countMax': int,
-        'disableable': bool,
-        'duration': int,
-        'durationMin': int,
-        'durationMax': int,
-        'elite': bool,
-        'enabled': bool,
-        'equal': float,
-        'feature': Origin,
-        'greater': float,
-        'interfaceSound': str,
-        'less': float,
-        'levelMin': int,
-        'levelMax': int,
-        'levelUpPriority': float,
-        'match': str,
-        'max': float,
-        'min': float,
-        'minMax': float,
-        'minMin': float,
-        'mul': float,
-        'mulMax': float,
-        'mulMin': float,
-        'name': Origin,
-        'passive': bool,
-        'psychicPower': bool,
-        'radius': int,
-        'rank': int,
-        'rankMax': int,
-        'range': int,
-        'reference': Origin,
-        'removeOnSourceDeath': bool,
-        'requiredActionPoints': bool,
-        'requiredMovement': bool,
-        'requiredUpgrade': Origin,
-        'shoutString': Origin,
-        'slotName': str,
-        'unit': Origin,
-        'unitType': Origin,
-        'usableInTransport': bool,
-        'visible': bool,
-        'weapon': Origin,
-        'weaponSlotName': Origin,
-        'weaponSlotNames': (tuple, Origin),
-    }
+    TYPES: ClassVar[dict[str, Any]] = _PARAM_TYPES
     type: str
     value: ParamValue
 
     def __post_init__(self) -> None:
-        if self.type not in self.TYPES:
+        if self.type not in _PARAM_TYPE_NAMES:
             raise TypeError(f"unrecognized parameter type: {self.type!r}")
 
     @property
-    def unresolved_refs(self) -> OrderedDict[str, Origin]:
-        return OrderedDict(sorted((k, v) for k, v in collect_unresolved_refs(self).items()))
+    def unresolved_refs(self) -> dict[str, Origin]:
+        return dict(sorted(collect_unresolved_refs(self).items()))
 
     @property
     def is_resolved(self) -> bool:
-        return not self.unresolved_refs
+        value = self.value
+        value_type = value.__class__
+        if value_type in _SCALAR_TYPES:
+            return True
+        if value_type is Origin:  # a single plain reference needs no walking
+            return not value._is_unresolved_ref
+        return not has_unresolved_refs(self)
 
 
-@dataclass(frozen=True)
+_HEAL_PARAM_TYPES = frozenset(("add", "addMin", "addMax"))
+
+
+@dataclass(frozen=True, slots=True)
 class Effect:
     name: str
     params: tuple[Parameter, ...]
     sub_effects: tuple["Effect", ...]
+    # derived once on init (slotted, so no `cached_property`), sub-effects come in ready-made
+    _all_params: tuple[Parameter, ...] = field(init=False, repr=False, compare=False)
+    _is_negative: bool = field(init=False, repr=False, compare=False)
+    _is_heal: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        params = list(self.params)
+        for e in self.sub_effects:
+            params.extend(e.all_params)
+        object.__setattr__(self, "_all_params", tuple(params))
+        name = self.name
+        object.__setattr__(
+            self, "_is_negative", len(name) > 3 and name.startswith("no") and name[2].isupper())
+        is_heal = False
+        if name == "hitpoints":
+            for p in self.params:  # the first additive param decides
+                if p.type in _HEAL_PARAM_TYPES:
+                    is_heal = p.value > 0
+                    break
+        object.__setattr__(self, "_is_heal", is_heal)
 
     @property
-    def all_params(self) -> list[Parameter]:
-        return [*self.params, *[p for e in self.sub_effects for p in e.all_params]]
+    def all_params(self) -> tuple[Parameter, ...]:
+        return self._all_params
 
     @property
-    def unresolved_refs(self) -> OrderedDict[str, Origin]:
-        return OrderedDict(sorted((k, v) for k, v in collect_unresolved_refs(self).items()))
+    def unresolved_refs(self) -> dict[str, Origin]:
+        return dict(sorted(collect_unresolved_refs(self).items()))
 
     @property
     def is_resolved(self) -> bool:
-        return not self.unresolved_refs
+        return not has_unresolved_refs(self)
 
     @property
     def is_negative(self) -> bool:
-        return len(self.name) > 3 and self.name.startswith("no") and self.name[2].isupper()
+        return self._is_negative
 
     @property
     def is_heal(self) -> bool:
-        heal_param = from_iterable(
-            self.params, lambda p: p.type in ("add", "addMin", "addMax"))
-        return self.name == "hitpoints" and heal_param and heal_param.value > 0
+        return self._is_heal
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CategoryEffect(Effect):
+    _category: str = field(init=False, repr=False, compare=False)
+
     def __post_init__(self) -> None:
-        if not self.is_valid(self.name):
+        category = self.get_category(self.name)
+        if category is None:
             raise TypeError(f"not a category effect: {self.name!r}")
+        object.__setattr__(self, "_category", category)
+        Effect.__post_init__(self)  # no zero-argument `super()` in slotted classes
 
-    @classmethod
-    def get_category(cls, name: str) -> str | None:
+    @staticmethod
+    @lru_cache(maxsize=None)  # effect names come from a small, fixed vocabulary
+    def get_category(name: str) -> str | None:
         if name == "city" or name == "noCity":
             return "Cities"
         if name in ("self", "opponent"):
             return "Units"
-        categories = [cat[:-1].lower() for cat in CATEGORIES]
-        cat = from_iterable(categories, lambda c: c in name.lower())
-        if not cat:
-            return None
-        return CATEGORIES[categories.index(cat)]
+        name = name.lower()
+        for lower, cat in _LOWER_CATEGORIES:
+            if lower in name:
+                return cat
+        return None
 
     @classmethod
     def is_valid(cls, name: str) -> bool:
@@ -346,7 +511,7 @@ class CategoryEffect(Effect):
 
     @property
     def category(self) -> str:
-        return self.get_category(self.name)
+        return self._category
 
     def applies_to_cat_and_trait(self, category: str, trait: str) -> bool:
         if self.category != category:
@@ -399,32 +564,34 @@ class Upgrade(ReferenceMixin, TextsMixin, Origin):
             raise ValueError("tier must be an integer between 1 and 10")
 
     def __hash__(self) -> int:
-        return hash(str(self.path))
+        return hash(self._path_str)
 
     def __eq__(self, other: "Upgrade") -> bool:
-        return str(self.path) == str(other.path)
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._path_str == other._path_str
 
     @property
-    def unresolved_refs(self) -> OrderedDict[str, Origin]:
-        return OrderedDict(sorted((k, v) for k, v in collect_unresolved_refs(self).items()))
+    def unresolved_refs(self) -> dict[str, Origin]:
+        return dict(sorted(collect_unresolved_refs(self).items()))
 
     @property
     def is_resolved(self) -> bool:
-        return not self.unresolved_refs
+        return not has_unresolved_refs(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class UpgradeWrapper:
     upgrade: Upgrade
     required_upgrades: list[Union["Upgrade",  Origin]]
 
     @property
-    def unresolved_refs(self) -> OrderedDict[str, Origin]:
-        return OrderedDict(sorted((k, v) for k, v in collect_unresolved_refs(self).items()))
+    def unresolved_refs(self) -> dict[str, Origin]:
+        return dict(sorted(collect_unresolved_refs(self).items()))
 
     @property
     def is_resolved(self) -> bool:
-        return not self.unresolved_refs
+        return not has_unresolved_refs(self)
 
     def to_upgrade(self) -> Upgrade:
         return Upgrade(
@@ -435,7 +602,7 @@ class UpgradeWrapper:
             reference=self.upgrade.reference,
             tier=self.upgrade.tier,
             dlc=self.upgrade.dlc,
-            required_upgrades=tuple(u for u in self.required_upgrades)
+            required_upgrades=tuple(self.required_upgrades)
         )
 
 
@@ -467,10 +634,20 @@ class ModifierType(Enum):
             return cls.UNKNOWN
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RequiredUpgradeMixin:
     required_upgrade: Upgrade | None
 
+    # defined here so that `slots=True` doesn't generate its own pickling that restores fields
+    # only: apart from slotted Modifiers (which get their own), subclasses aren't slotted and keep
+    # what they derive on init or cache later in `__dict__`
+    def __getstate__(self) -> dict[str, Any]:
+        return {**self.__dict__, "required_upgrade": self.required_upgrade}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
     @property
     def is_basic(self) -> bool:
         return not self.required_upgrade
@@ -482,41 +659,55 @@ class RequiredUpgradeMixin:
         return self.required_upgrade.tier
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Modifier(RequiredUpgradeMixin):
     type: ModifierType
     conditions: tuple[Effect, ...]
     effects: tuple[Effect, ...]
+    # flattened once on init just like `Effect.all_params`
+    _all_effects: tuple[Effect, ...] = field(init=False, repr=False, compare=False)
+    _all_params: tuple[Parameter, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        all_effects = (*self.conditions, *self.effects)
+        params = []
+        for e in all_effects:
+            params.extend(e.all_params)
+        object.__setattr__(self, "_all_effects", all_effects)
+        object.__setattr__(self, "_all_params", tuple(params))
 
     @property
-    def all_effects(self) -> list[Effect]:
-        return [*self.conditions, *self.effects]
+    def all_effects(self) -> tuple[Effect, ...]:
+        return self._all_effects
 
     @property
-    def all_params(self) -> list[Parameter]:
-        return [p for e in self.all_effects for p in e.all_params]
+    def all_params(self) -> tuple[Parameter, ...]:
+        return self._all_params
 
     @property
-    def unresolved_refs(self) -> OrderedDict[str, Origin]:
-        return OrderedDict(sorted((k, v) for k, v in collect_unresolved_refs(self).items()))
+    def unresolved_refs(self) -> dict[str, Origin]:
+        return dict(sorted(collect_unresolved_refs(self).items()))
 
     @property
     def is_resolved(self) -> bool:
-        return not self.unresolved_refs
+        return not has_unresolved_refs(self)
 
     @property
     def is_heal(self) -> bool:
-        return any(e.is_heal for e in self.effects)
+        for e in self.effects:
+            if e.is_heal:
+                return True
+        return False
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Area:
     affects: Literal["Unit", "Player", "Tile"]
     radius: int | None
     exclude_radius: int | None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AreaModifier(Modifier):
     area: Area
 
@@ -525,21 +716,37 @@ class AreaModifier(Modifier):
 class ModifiersMixin:
     modifiers: tuple[Modifier | AreaModifier, ...]
 
-    @property
-    def all_effects(self) -> list[Effect]:
-        return [e for m in self.modifiers for e in m.all_effects]
+    def _modifier_effects(self) -> list[Effect]:
+        # not `super().all_effects` in the overrides: that would store this partial result under
+        # the overriding name and serve it from then on if the rest of an override raised
+        effects = []
+        for m in self.modifiers:
+            effects.extend(m.all_effects)
+        return effects
 
-    @property
-    def mod_effects(self) -> list[Effect]:
-        return [e for m in self.modifiers for e in m.effects]
+    # effects are cached as dereferencing only ever swaps their params' values, never them
+    @cached_property
+    def all_effects(self) -> tuple[Effect, ...]:
+        return tuple(self._modifier_effects())
+
+    @cached_property
+    def mod_effects(self) -> tuple[Effect, ...]:
+        effects = []
+        for m in self.modifiers:
+            effects.extend(m.effects)
+        return tuple(effects)
+
+    @cached_property
+    def mod_effect_names(self) -> tuple[str, ...]:  # unique, in order of appearance
+        return tuple(dict.fromkeys(e.name for e in self.mod_effects))
 
     @property
-    def unresolved_refs(self) -> OrderedDict[str, Origin]:
-        return OrderedDict(sorted((k, v) for k, v in collect_unresolved_refs(self).items()))
+    def unresolved_refs(self) -> dict[str, Origin]:
+        return dict(sorted(collect_unresolved_refs(self).items()))
 
     @property
     def is_resolved(self) -> bool:
-        return not self.unresolved_refs
+        return not has_unresolved_refs(self)
 
     @property
     def augmentations(self) -> tuple[Upgrade, ...]:
@@ -549,13 +756,21 @@ class ModifiersMixin:
     def is_augmentable(self) -> bool:
         return bool(self.augmentations)
 
-    @lru_cache()
+    @cached_property
+    def _key_effects(self) -> dict[str, Effect]:
+        # the first single-param mod effect of each name
+        key_effects = {}
+        for effect in self.mod_effects:
+            if len(effect.params) == 1 and effect.name not in key_effects:
+                key_effects[effect.name] = effect
+        return key_effects
+
     def get_key_property(self, name: str, convert_to: Type = None) -> ParamValue | None:
-        for effect in [e for e in self.mod_effects if len(e.params) == 1]:
-            if effect.name == name:
-                param = effect.params[0]
-                return param.value if convert_to is None else convert_to(param.value)
-        return None
+        effect = self._key_effects.get(name)
+        if effect is None:
+            return None
+        value = effect.params[0].value
+        return value if convert_to is None else convert_to(value)
 
 
 # Traits are different than Actions and Modifiers (other XML tags that can sometimes possess
@@ -577,14 +792,16 @@ class Trait(RequiredUpgradeMixin, ModifiersMixin, ReferenceMixin, TextsMixin, Or
             raise ValueError(f"not a path to a trait .xml: {self.path}")
 
     def __hash__(self) -> int:
-        return hash(str(self.path))
+        return hash(self._path_str)
 
-    def __eq__(self, other: "Upgrade") -> bool:
-        return str(self.path) == str(other.path)
+    def __eq__(self, other: "Trait") -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._path_str == other._path_str
 
-    @property
-    def all_effects(self) -> list[Effect]:  # override
-        return [*self.target_conditions, *super().all_effects]
+    @cached_property
+    def all_effects(self) -> tuple[Effect, ...]:  # override
+        return *self.target_conditions, *self._modifier_effects()
 
     @property
     def is_faction_specific(self) -> bool:  # makes sense only for Traits
@@ -615,13 +832,16 @@ class Target(ModifiersMixin):
     line_of_sight: int | None
     conditions: tuple[Effect, ...]
 
-    @property
-    def all_effects(self) -> list[Effect]:  # override
-        return [*self.conditions, *super().all_effects]
+    @cached_property
+    def all_effects(self) -> tuple[Effect, ...]:  # override
+        return *self.conditions, *self._modifier_effects()
 
     @property
     def is_heal(self) -> bool:
-        return any(m.is_heal for m in self.modifiers)
+        for m in self.modifiers:
+            if m.is_heal:
+                return True
+        return False
 
     @property
     def is_organic_only_heal(self) -> bool:
@@ -640,17 +860,38 @@ class Target(ModifiersMixin):
 class TraitsMixin:
     traits: tuple[Trait, ...]
 
+    # in one pass and stored (see the module docstring)
+    @cached_property
+    def _trait_groups(self) -> tuple[tuple[Trait, ...], ...]:
+        basic, upgrade_requiring, augmentable = [], [], []
+        for t in self.traits:
+            if t.is_basic:
+                basic.append(t)
+            else:
+                upgrade_requiring.append(t)
+            if t.is_augmentable:
+                augmentable.append(t)
+        return tuple(basic), tuple(upgrade_requiring), tuple(augmentable)
+
     @property
-    def basic_traits(self) -> list[Trait]:
-        return [t for t in self.traits if t.is_basic]
+    def basic_traits(self) -> tuple[Trait, ...]:
+        return self._trait_groups[0]
 
     @property
-    def upgrade_requiring_traits(self) -> list[Trait]:
-        return [t for t in self.traits if not t.is_basic]
+    def upgrade_requiring_traits(self) -> tuple[Trait, ...]:
+        return self._trait_groups[1]
 
     @property
-    def augmentable_traits(self) -> list[Trait]:
-        return [t for t in self.traits if t.is_augmentable]
+    def augmentable_traits(self) -> tuple[Trait, ...]:
+        return self._trait_groups[2]
+
+    @cached_property
+    def _basic_trait_paths(self) -> frozenset[str]:
+        return frozenset(str(t.category_path) for t in self.basic_traits)
+
+    @cached_property
+    def _trait_paths(self) -> frozenset[str]:
+        return frozenset(str(t.category_path) for t in self.traits)
 
     def has_trait(self, trait: str, basic=True) -> bool:
         if not trait:
@@ -658,8 +899,7 @@ class TraitsMixin:
         if not trait.startswith("Traits/"):
             trait = trait[0].upper() + trait[1:]
             trait = f"Traits/{trait}"
-        traits = self.basic_traits if basic else self.traits
-        return any(t.matches(trait) for t in traits)
+        return trait in (self._basic_trait_paths if basic else self._trait_paths)
 
 
 class WeaponType(Enum):
@@ -713,23 +953,25 @@ class Weapon(TraitsMixin, RequiredUpgradeMixin, ModifiersMixin, ReferenceMixin,
             raise ValueError(f"not a path to a weapon .xml: {self.path}")
 
     def __hash__(self) -> int:
-        return hash(str(self.path))
+        return hash(self._path_str)
 
-    def __eq__(self, other: "Upgrade") -> bool:
-        return str(self.path) == str(other.path)
+    def __eq__(self, other: "Weapon") -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._path_str == other._path_str
 
-    @property
-    def all_effects(self) -> list[Effect]:  # override
-        target_effects = self.target.all_effects if self.target else []
-        return [*super().all_effects, *self.traits] + target_effects
+    @cached_property
+    def all_effects(self) -> tuple[Effect, ...]:  # override
+        target_effects = self.target.all_effects if self.target else ()
+        return *self._modifier_effects(), *self.traits, *target_effects
 
-    # key properties
-    @property
+    # key properties (numeric and never references, so safe to store on first access)
+    @cached_property
     def attacks(self) -> int | None:
         result = self.get_key_property("attacks", int)
         return result if result is not None else self.get_key_property("rangedAttacks", int)
 
-    @property
+    @cached_property
     def melee_attacks(self) -> int | None:
         return self.get_key_property("meleeAttacks", int)
 
@@ -737,11 +979,11 @@ class Weapon(TraitsMixin, RequiredUpgradeMixin, ModifiersMixin, ReferenceMixin,
     # def accuracy(self) -> int | None:  # TODO: 2 params!
     #     return self.get_key_property("accuracy", int)
     #
-    @property
+    @cached_property
     def melee_accuracy(self) -> int | None:
         return self.get_key_property("meleeAccuracy", int)
 
-    @property
+    @cached_property
     def ranged_accuracy(self) -> int | None:
         return self.get_key_property("rangedAccuracy", int)
 
@@ -770,15 +1012,16 @@ class Action(RequiredUpgradeMixin, ModifiersMixin, ReferenceMixin):
     def __eq__(self, other: "Action") -> bool:
         return (self.name, self.texts) == (other.name, other.texts)
 
-    @property
-    def all_effects(self) -> list[Effect]:  # override
-        target_effects = [e for t in self.targets for e in t.all_effects]
-        return [*super().all_effects, *self.conditions, *target_effects]
+    @cached_property
+    def all_effects(self) -> tuple[Effect, ...]:  # override
+        effects = [*self._modifier_effects(), *self.conditions]
+        for t in self.targets:
+            effects.extend(t.all_effects)
+        return tuple(effects)
 
     @property
     def is_simple(self) -> bool:
-        return all(
-            not item for item in (self.params, self.modifiers, self.conditions, self.targets))
+        return not (self.params or self.modifiers or self.conditions or self.targets)
 
     @property
     def is_elaborate(self) -> bool:
@@ -786,12 +1029,17 @@ class Action(RequiredUpgradeMixin, ModifiersMixin, ReferenceMixin):
 
     @property
     def is_heal(self) -> bool:
-        return any(t.is_heal for t in self.targets)
+        for t in self.targets:
+            if t.is_heal:
+                return True
+        return False
 
     @property
     def is_self_heal(self) -> bool:
-        healing_targets = [t for t in self.targets if t.is_heal]
-        return any(t.is_self_target for t in healing_targets)
+        for t in self.targets:
+            if t.is_heal and t.is_self_target:
+                return True
+        return False
 
     @property
     def is_organic_only_heal(self) -> bool:
@@ -827,33 +1075,72 @@ class Action(RequiredUpgradeMixin, ModifiersMixin, ReferenceMixin):
 class ActionsMixin:
     actions: tuple[Action, ...]
 
+    # in one pass and stored (see the module docstring)
+    @cached_property
+    def _action_groups(self) -> tuple[tuple[Action, ...], ...]:
+        simple, elaborate, basic, upgrade_requiring, weapon_requiring, augmentable = (
+            [], [], [], [], [], [])
+        for a in self.actions:
+            if a.is_simple:
+                simple.append(a)
+                continue
+            elaborate.append(a)
+            if a.is_basic:
+                basic.append(a)
+            else:
+                upgrade_requiring.append(a)
+            if a.required_weapons:
+                weapon_requiring.append(a)
+            if a.is_augmentable:
+                augmentable.append(a)
+        return (tuple(simple), tuple(elaborate), tuple(basic), tuple(upgrade_requiring),
+                tuple(weapon_requiring), tuple(augmentable))
+
     @property
-    def simple_actions(self) -> list[Action]:
-        return [a for a in self.actions if a.is_simple]
+    def simple_actions(self) -> tuple[Action, ...]:
+        return self._action_groups[0]
 
     @property
-    def elaborate_actions(self) -> list[Action]:
-        return [a for a in self.actions if a.is_elaborate]
+    def elaborate_actions(self) -> tuple[Action, ...]:
+        return self._action_groups[1]
 
     @property
-    def basic_actions(self) -> list[Action]:  # no upgrade required
-        return [a for a in self.elaborate_actions if a.is_basic]
+    def basic_actions(self) -> tuple[Action, ...]:  # no upgrade required
+        return self._action_groups[2]
 
     @property
-    def upgrade_requiring_actions(self) -> list[Action]:
-        return [a for a in self.elaborate_actions if not a.is_basic]
+    def upgrade_requiring_actions(self) -> tuple[Action, ...]:
+        return self._action_groups[3]
 
     @property
-    def weapon_requiring_actions(self) -> list[Action]:
-        return [a for a in self.elaborate_actions if a.required_weapons]
+    def weapon_requiring_actions(self) -> tuple[Action, ...]:
+        return self._action_groups[4]
 
     @property
-    def augmentable_actions(self) -> list[Action]:
-        return [a for a in self.elaborate_actions if a.is_augmentable]
+    def augmentable_actions(self) -> tuple[Action, ...]:
+        return self._action_groups[5]
+
+    @cached_property
+    def _elaborate_action_names(self) -> frozenset[str]:
+        return frozenset(a.name for a in self.elaborate_actions)
+
+    @cached_property
+    def _action_names(self) -> frozenset[str]:
+        return frozenset(a.name for a in self.actions)
 
     def has_action(self, action: str, elaborate=True) -> bool:
-        actions = self.elaborate_actions if elaborate else self.actions
-        return any(a.name == action for a in actions)
+        return action in (self._elaborate_action_names if elaborate else self._action_names)
+
+
+# basic traits that `Unit`'s trait-based classifiers look for, each given a bit of its
+# `_trait_flags`
+_UNIT_TRAIT_FLAGS = {f"Traits/{trait}": 1 << i for i, trait in enumerate((
+    "Artefact", "Fortification", "Vehicle", "Hero", "MonstrousCreature", "Tank", "Transport",
+    "Walker", "Bike", "Jetbike", "JetPack", "Flyer", "Skimmer", "OpenTopped", "Gargantuan",
+    "Psyker", "Daemon", "Amphibious", "Fearless", "Relentless", "Zealot",
+))}
+_MECHANICAL_MASK = _UNIT_TRAIT_FLAGS["Traits/Vehicle"] | _UNIT_TRAIT_FLAGS["Traits/Fortification"]
+_NON_INFANTRY_MASK = _MECHANICAL_MASK | _UNIT_TRAIT_FLAGS["Traits/MonstrousCreature"]
 
 
 @dataclass(frozen=True)
@@ -870,10 +1157,12 @@ class Unit(RequiredUpgradeMixin, ActionsMixin, TraitsMixin, ModifiersMixin, Refe
             raise ValueError(f"not a path to an unit .xml: {self.path}")
 
     def __hash__(self) -> int:
-        return hash(str(self.path))
+        return hash(self._path_str)
 
-    def __eq__(self, other: "Upgrade") -> bool:
-        return str(self.path) == str(other.path)
+    def __eq__(self, other: "Unit") -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._path_str == other._path_str
 
     @classmethod
     def with_producer(
@@ -894,37 +1183,52 @@ class Unit(RequiredUpgradeMixin, ActionsMixin, TraitsMixin, ModifiersMixin, Refe
             producer=producer
         )
 
-    @property
-    def all_effects(self) -> list[Effect]:  # override
-        weapon_effects = [e for w in self.weapons for e in w.all_effects]
-        action_effects = [e for a in self.actions for e in a.all_effects]
-        trait_effects = [e for t in self.traits for e in t.all_effects]
-        return [*super().all_effects, *weapon_effects, *action_effects, *trait_effects]
+    @cached_property
+    def all_effects(self) -> tuple[Effect, ...]:  # override
+        effects = self._modifier_effects()
+        for w in self.weapons:
+            effects.extend(w.all_effects)
+        for a in self.actions:
+            effects.extend(a.all_effects)
+        for t in self.traits:
+            effects.extend(t.all_effects)
+        return tuple(effects)
 
     @property
     def tier(self) -> int | None:  # override
-        tier = super().tier
+        return self._get_tier()[0]
+
+    def _get_tier(self) -> tuple[int | None, bool]:
+        # walks the producer chain, so the result is stored (like a `cached_property` would) but
+        # only once every link of the chain is concrete, otherwise dereferencing could change it
+        if "_tier" in self.__dict__:
+            return self.__dict__["_tier"], True
+        tier, is_final = super().tier, True
         if tier is None:
-            if isinstance(self.producer, Building) and self.producer.required_upgrade:
-                tier = self.producer.required_upgrade.tier
+            if isinstance(self.producer, Building):
+                if self.producer.required_upgrade:
+                    tier = self.producer.required_upgrade.tier
             elif isinstance(self.producer, Unit):
-                tier = self.producer.tier
+                tier, is_final = self.producer._get_tier()
+            elif self.producer is not None:  # still an unresolved Origin
+                is_final = False
         if (tier is None
                 and not self.is_artefact
                 and not self.is_fortification
                 and self.faction != "Neutral"):
-            return 0
-        return tier
+            tier = 0
+        if is_final:
+            self.__dict__["_tier"] = tier
+        return tier, is_final
 
-    @property
+    @cached_property
     def cost(self) -> dict[str, float]:
         return self._get_cost()
 
-    @property
+    @cached_property
     def upkeep(self) -> dict[str, float]:
         return self._get_cost(upkeep=True)
 
-    @lru_cache()
     def _get_cost(self, upkeep=False) -> dict[str, float]:
         suffix = "Upkeep" if upkeep else "Cost"
         cost_effects = [e for e in self.mod_effects
@@ -937,19 +1241,19 @@ class Unit(RequiredUpgradeMixin, ActionsMixin, TraitsMixin, ModifiersMixin, Refe
 
     # TODO: re-check param types (in weapons there are variations within same property)
     # key properties
-    @property
+    @cached_property
     def armor(self) -> int | None:
         return self.get_key_property("armor", int)
 
-    @property
+    @cached_property
     def hitpoints(self) -> int | None:
         return self.get_key_property("hitpointsMax", int)
 
-    @property
+    @cached_property
     def total_hitpoints(self) -> int | None:
         return self.group_size * self.hitpoints if self.hitpoints is not None else None
 
-    @property
+    @cached_property
     def morale(self) -> int:
         return self.get_key_property("moraleMax", int)
 
@@ -978,114 +1282,121 @@ class Unit(RequiredUpgradeMixin, ActionsMixin, TraitsMixin, ModifiersMixin, Refe
         return self.get_key_property("cargoSlots", int)
 
     # weapons
-    @property
-    def basic_weapons(self) -> list[Weapon]:
-        return [w for w in self.weapons if w.is_basic]
+    @cached_property
+    def basic_weapons(self) -> tuple[Weapon, ...]:
+        return tuple(w for w in self.weapons if w.is_basic)
 
-    @property
-    def upgrade_requiring_weapons(self) -> list[Weapon]:
-        return [w for w in self.weapons if not w.is_basic]
+    @cached_property
+    def upgrade_requiring_weapons(self) -> tuple[Weapon, ...]:
+        return tuple(w for w in self.weapons if not w.is_basic)
 
-    @property
-    def augmentable_weapons(self) -> list[Weapon]:
-        return [w for w in self.weapons if w.is_augmentable]
+    @cached_property
+    def augmentable_weapons(self) -> tuple[Weapon, ...]:
+        return tuple(w for w in self.weapons if w.is_augmentable)
+
+    # trait-based classifiers (bit tests against the basic traits gathered in one pass)
+    @cached_property
+    def _trait_flags(self) -> int:
+        flags = 0
+        for t in self.basic_traits:
+            flags |= _UNIT_TRAIT_FLAGS.get(t._category_path_str, 0)
+        return flags
 
-    # trait-based classifiers
     @property
     def is_artefact(self) -> bool:
-        return self.has_trait("Artefact")
+        return bool(self._trait_flags & _UNIT_TRAIT_FLAGS["Traits/Artefact"])
 
     @property
     def is_fortification(self) -> bool:  # most are transports too (hold cargo)
-        return self.has_trait("Fortification")
+        return bool(self._trait_flags & _UNIT_TRAIT_FLAGS["Traits/Fortification"])
 
     @property
     def is_vehicle(self) -> bool:
-        return self.has_trait("Vehicle")
+        return bool(self._trait_flags & _UNIT_TRAIT_FLAGS["Traits/Vehicle"])
 
     @property
     def is_hero(self) -> bool:
-        return self.has_trait("Hero")
+        return bool(self._trait_flags & _UNIT_TRAIT_FLAGS["Traits/Hero"])
 
     @property
     def is_monstrous_creature(self) -> bool:
-        return self.has_trait("MonstrousCreature")
+        return bool(self._trait_flags & _UNIT_TRAIT_FLAGS["Traits/MonstrousCreature"])
 
     @property
     def is_infantry(self) -> bool:  # based on Painboy healing
-        return not self.is_fortification and not self.is_vehicle and not self.is_monstrous_creature
+        return not self._trait_flags & _NON_INFANTRY_MASK
 
     @property
     def is_tank(self) -> bool:  # subset of vehicles
-        return self.has_trait("Tank")
+        return bool(self._trait_flags & _UNIT_TRAIT_FLAGS["Traits/Tank"])
 
     @property
     def is_transport(self) -> bool:  # most are vehicles (apart from 2 monstrous creatures)
-        return self.has_trait("Transport")
+        return bool(self._trait_flags & _UNIT_TRAIT_FLAGS["Traits/Transport"])
 
     @property
     def is_walker(self) -> bool:  # subset of vehicles
-        return self.has_trait("Walker")
+        return bool(self._trait_flags & _UNIT_TRAIT_FLAGS["Traits/Walker"])
 
     @property
     def is_bike(self) -> bool:  # only two
-        return self.has_trait("Bike")
+        return bool(self._trait_flags & _UNIT_TRAIT_FLAGS["Traits/Bike"])
 
     @property
     def is_jetbike(self) -> bool:
-        return self.has_trait("Jetbike")
+        return bool(self._trait_flags & _UNIT_TRAIT_FLAGS["Traits/Jetbike"])
 
     @property
     def is_jetpack_user(self) -> bool:
-        return self.has_trait("JetPack")
+        return bool(self._trait_flags & _UNIT_TRAIT_FLAGS["Traits/JetPack"])
 
     @property
     def is_flyer(self) -> bool:  # subset of vehicles
-        return self.has_trait("Flyer")
+        return bool(self._trait_flags & _UNIT_TRAIT_FLAGS["Traits/Flyer"])
 
     @property
     def is_skimmer(self) -> bool:
-        return self.has_trait("Skimmer")
+        return bool(self._trait_flags & _UNIT_TRAIT_FLAGS["Traits/Skimmer"])
 
     @property
     def is_open_topped(self) -> bool:  # subset of vehicles
-        return self.has_trait("OpenTopped")
+        return bool(self._trait_flags & _UNIT_TRAIT_FLAGS["Traits/OpenTopped"])
 
     @property
     def is_gargantuan(self) -> bool:
-        return self.has_trait("Gargantuan")
+        return bool(self._trait_flags & _UNIT_TRAIT_FLAGS["Traits/Gargantuan"])
 
     @property
     def is_psyker(self) -> bool:
-        return self.has_trait("Psyker")
+        return bool(self._trait_flags & _UNIT_TRAIT_FLAGS["Traits/Psyker"])
 
     @property
     def is_daemon(self) -> bool:
-        return self.has_trait("Daemon")
+        return bool(self._trait_flags & _UNIT_TRAIT_FLAGS["Traits/Daemon"])
 
     @property
     def is_amphibious(self) -> bool:  # only one (Chimera)
-        return self.has_trait("Amphibious")
+        return bool(self._trait_flags & _UNIT_TRAIT_FLAGS["Traits/Amphibious"])
 
     @property
     def is_fearless(self) -> bool:
-        return self.has_trait("Fearless")
+        return bool(self._trait_flags & _UNIT_TRAIT_FLAGS["Traits/Fearless"])
 
     @property
     def is_relentless(self) -> bool:
-        return self.has_trait("Relentless")
+        return bool(self._trait_flags & _UNIT_TRAIT_FLAGS["Traits/Relentless"])
 
     @property
     def is_zealot(self) -> bool:
-        return self.has_trait("Zealot")
+        return bool(self._trait_flags & _UNIT_TRAIT_FLAGS["Traits/Zealot"])
 
     @property
     def is_mechanical(self) -> bool:  # important for healing
-        return self.is_vehicle or self.is_fortification
+        return bool(self._trait_flags & _MECHANICAL_MASK)
 
     @property
     def is_organic(self) -> bool:  # important for healing
-        return not self.is_mechanical
+        return not self._trait_flags & _MECHANICAL_MASK
 
     # action-based classifiers
     @property
@@ -1100,11 +1411,11 @@ class Unit(RequiredUpgradeMixin, ActionsMixin, TraitsMixin, ModifiersMixin, Refe
     def is_tile_cleaner(self) -> bool:
         return self.has_action("clearTileUnitAbility")
 
-    @property
+    @cached_property
     def is_healer(self) -> bool:
         return any(a.is_heal for a in self.elaborate_actions)
 
-    @property
+    @cached_property
     def is_self_healer(self) -> bool:
         return any(a.is_self_heal for a in self.elaborate_actions)
 
@@ -1137,14 +1448,16 @@ class Unit(RequiredUpgradeMixin, ActionsMixin, TraitsMixin, ModifiersMixin, Refe
 class Building(RequiredUpgradeMixin, TraitsMixin, ActionsMixin, ModifiersMixin, TextsMixin, Origin):
 
     def __hash__(self) -> int:
-        return hash(str(self.path))
+        return hash(self._path_str)
 
-    def __eq__(self, other: "Upgrade") -> bool:
-        return str(self.path) == str(other.path)
+    def __eq__(self, other: "Building") -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._path_str == other._path_str
 
-    @property
-    def _produce_unit_actions(self) -> list[Action]:
-        return [a for a in self.actions if a.name == "produceUnit"]
+    @cached_property
+    def _produce_unit_actions(self) -> tuple[Action, ...]:
+        return tuple(a for a in self.actions if a.name == "produceUnit")
 
     @property
     def produced_units(self) -> list[Unit]:
@@ -1152,39 +1465,64 @@ class Building(RequiredUpgradeMixin, TraitsMixin, ActionsMixin, ModifiersMixin,
             return []
         return [p.value for a in self._produce_unit_actions for p in a.params if p.type == "unit"]
 
-    def get_matching_action(self, unit: "Unit") -> Action | None:
+    # keyed by category path, which stays the same when dereferencing swaps an Origin for a Unit
+    @cached_property
+    def _matching_actions(self) -> dict[str, Action]:
+        matching_actions = {}
         for action in self._produce_unit_actions:
             for param in action.params:
-                if param.value.category_path == unit.category_path:
-                    return action
-        return None
+                if isinstance(param.value, Origin):
+                    matching_actions.setdefault(param.value._category_path_str, action)
+        return matching_actions
+
+    def get_matching_action(self, unit: "Unit") -> Action | None:
+        return self._matching_actions.get(unit._category_path_str)
 
 
-def get_mod_effects(objects: list[Data | Action], most_numerous_first=False
-                    ) -> OrderedDict[str, list[Data | Action]]:
+def get_mod_effects(objects: list[Data | Action], most_numerous_first=False, sort=True
+                    ) -> dict[str, list[Data | Action]]:
     effects_map = defaultdict(list)
     for obj in objects:
-        for e in {e.name for m in obj.modifiers for e in m.effects}:
-            effects_map[e].append(obj)
+        for name in obj.mod_effect_names:  # each object is listed once per effect name
+            effects_map[name].append(obj)
     if most_numerous_first:
-        new_map = [(k, v) for k, v in effects_map.items()]
-        new_map.sort(key=lambda pair: len(pair[1]), reverse=True)
-        return OrderedDict(new_map)
-    return OrderedDict(sorted((k, v) for k, v in effects_map.items()))
+        return dict(sorted(effects_map.items(), key=lambda pair: len(pair[1]), reverse=True))
+    if not sort:  # in order of first appearance
+        return dict(effects_map)
+    return dict(sorted(effects_map.items(), key=lambda pair: pair[0]))
+
+
+def index_by_name(objects: list[Data | Action]) -> dict[str, Data | Action]:
+    """Return ``objects`` keyed by name (the first match wins, as in `get_obj()`).
+
+    Pass the result instead of the list to `get_obj()` and `get_objects()` to have repeated
+    lookups in the same objects done in constant time.
+    """
+    index = {}
+    for obj in objects:
+        index.setdefault(obj.name, obj)
+    return index
 
 
-def get_obj(objects: list[Data | Action], name: str) -> Data | Action | None:
-    return from_iterable(objects, lambda o: o.name == name)
+def get_obj(objects: list[Data | Action] | dict[str, Data | Action],
+            name: str) -> Data | Action | None:
+    if isinstance(objects, dict):  # indexed by `index_by_name()`
+        return objects.get(name)
+    for obj in objects:
+        if obj.name == name:
+            return obj
+    return None
 
 
-def get_objects(objects: list[Data | Action], *names: str) -> list[Data | Action | None]:
-    d = {n: i for i, n in enumerate(names)}
-    retrieved = []
+def get_objects(objects: list[Data | Action] | dict[str, Data | Action],
+                *names: str) -> list[Data | Action | None]:
+    if isinstance(objects, dict):  # indexed by `index_by_name()`
+        return [objects.get(name) for name in names]
+    wanted, found = set(names), {}
     for obj in objects:
-        if obj.name in names:
-            retrieved.append((obj, d[obj.name]))
-    for name in names:  # match number of outputs with number of inputs
-        if name not in {r.name for r, _ in retrieved}:
-            retrieved.append((None, d[name]))
-    retrieved.sort(key=lambda r: r[1])  # preserve the input ordering
-    return [r[0] for r in retrieved]
+        if obj.name in wanted and obj.name not in found:  # the first match wins
+            found[obj.name] = obj
+            if len(found) == len(wanted):  # no need to look any further
+                break
+    # match number (and ordering) of outputs with number of inputs
+    return [found.get(name) for name in names]
@@ -10,7 +10,8 @@
 import logging
 from collections import deque
 
-from gladiunits.data import Building, Data, Trait, Unit, Upgrade, UpgradeWrapper, Weapon
+from gladiunits.data import (Building, Data, Origin, Trait, Unit, Upgrade, UpgradeWrapper, Weapon,
+                             collect_unresolved_refs)
 
 _log = logging.getLogger(__name__)
 
@@ -53,13 +54,29 @@ class Dereferencer:
     def context(self) -> dict[str, Data]:
         return self._context
 
-    def __init__(self, base: Data, context: dict[str, Data]) -> None:
+    @property
+    def unresolved_refs(self) -> dict[str, Origin]:
+        """Return references of the base object left unresolved after `resolve()`.
+
+        Derived from the references collected on init instead of walking the base object again,
+        unless some of the substituted objects have been let into the context with references of
+        their own left. Unlike the data objects' `unresolved_refs`, not sorted.
+        """
+        if any(id(obj) in self._incomplete for obj in self._resolved.values()):
+            return collect_unresolved_refs(self.base)
+        return {ref: value for ref, value in self._refs.items() if ref not in self._resolved}
+
+    def __init__(
+            self, base: Data, context: dict[str, Data], incomplete: set[int] = frozenset()
+    ) -> None:
         self._base, self._context = base, context
+        self._incomplete = incomplete  # ids of context objects that aren't fully resolved
+        self._refs = collect_unresolved_refs(self.base)  # resolution doesn't depend on order
         self._resolved = self._get_resolved()
 
     def _get_resolved(self) -> dict[str, Data]:
         resolved = {}
-        for ref, value in self.base.unresolved_refs.items():
+        for ref, value in self._refs.items():
             obj = self.context.get(str(value))
             if obj:
                 resolved[ref] = obj
@@ -76,7 +93,8 @@ class Dereferencer:
                         current_obj[int(token)] = replacer
                     else:
                         # mutating frozen dataclasses, nothing to see here, move along... :)
-                        current_obj.__dict__[token] = replacer
+                        # (`object.__setattr__` as some of them are slotted and have no `__dict__`)
+                        object.__setattr__(current_obj, token, replacer)
                     break
 
                 if token.isdigit():
@@ -91,11 +109,13 @@ def dereference(resolved: dict[str, Data],
     _log.info(f"Dereferencing {len(unresolved)} objects...")
     stack = unresolved[::-1]
     stack = deque(stack)
+    incomplete = set()
     while stack:
         obj = stack.pop()
-        deref = Dereferencer(obj, context=resolved)
+        deref = Dereferencer(obj, context=resolved, incomplete=incomplete)
         deref.resolve()
-        if obj.is_resolved:
+        unresolved_refs = deref.unresolved_refs
+        if not unresolved_refs:
             try:
                 resolved[str(obj.category_path)] = obj
             except AttributeError as e:  # an upgrade wrapper
@@ -106,9 +126,10 @@ def dereference(resolved: dict[str, Data],
                     raise
         else:
             if ignored_categories:
-                cats = [ref.category for ref in obj.unresolved_refs.values()]
+                cats = [ref.category for ref in unresolved_refs.values()]
                 if all(c in ignored_categories for c in cats):
                     resolved[str(obj.category_path)] = obj
+                    incomplete.add(id(obj))
                     continue
             stack.appendleft(obj)
 
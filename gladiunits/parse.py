@@ -27,18 +27,21 @@
 import logging
 import os
 import re
+import sys
 from abc import abstractmethod
 from collections import deque
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable
 
 import lxml
 from lxml.etree import XMLSyntaxError, _Element as Element
 
 from gladiunits.constants import PathLike, T, XML_DIR
-from gladiunits.data import (Action, Area, AreaModifier, Building, CATEGORIES, CategoryEffect, Data,
-                             Effect, FACTIONS, Modifier, ModifierType, Origin, Parameter, Target,
-                             TextsMixin, Trait, Unit, Upgrade, UpgradeWrapper, Weapon, WeaponType)
+from gladiunits.data import (Action, Area, AreaModifier, Building, CATEGORIES_SET, CategoryEffect,
+                             Data, Effect, FACTIONS_SET, Modifier, ModifierType, Origin, Parameter,
+                             Target, TextsMixin, Trait, Unit, Upgrade, UpgradeWrapper, Weapon,
+                             WeaponType)
 from gladiunits.dereference import dereference, get_context
 from gladiunits.utils import from_iterable
 
@@ -64,6 +67,12 @@ class File:
 
 class _EntryLine:
     PATTERN_TEMPLATE = r'{}=\"(.*)\"'
+    # compiled once for all the (attr, double_quotes) combinations actually parsed
+    PATTERNS = {
+        ("name", True): re.compile(PATTERN_TEMPLATE.format("name")),
+        ("value", True): re.compile(PATTERN_TEMPLATE.format("value")),
+        ("name", False): re.compile(PATTERN_TEMPLATE.replace('"', "'").format("name")),
+    }
 
     @property
     def name(self) -> str:
@@ -105,11 +114,13 @@ class _EntryLine:
 
     @classmethod
     def _parse(cls, text: str, attr: str, double_quotes=True) -> str:
-        if double_quotes:
-            pattern = cls.PATTERN_TEMPLATE.format(attr)
-        else:
-            pattern = cls.PATTERN_TEMPLATE.replace('"', "'").format(attr)
-        compiled_pattern = re.compile(pattern)
+        compiled_pattern = cls.PATTERNS.get((attr, double_quotes))
+        if compiled_pattern is None:
+            if double_quotes:
+                pattern = cls.PATTERN_TEMPLATE.format(attr)
+            else:
+                pattern = cls.PATTERN_TEMPLATE.replace('"', "'").format(attr)
+            compiled_pattern = re.compile(pattern)
         match = compiled_pattern.search(text)
         if not match:
             raise ValueError(f"cannot parse {attr!r} in '{text}'")
@@ -147,7 +158,7 @@ class _CoreFileParser(File):
 
     def __init__(self, file: PathLike) -> None:
         super().__init__(file)
-        if self.category not in CATEGORIES:
+        if self.category not in CATEGORIES_SET:
             raise ValueError(f"unknown category: {self.category!r}")
         self._entry_lines = []
         for line in self.lines:
@@ -190,17 +201,40 @@ DISPLAYED_TEXTS = _parse_displayed_texts()
 
 
 def get_texts(origin: Origin) -> TextsMixin | None:
+    return _get_texts(str(origin.category_path))
+
+
+# the same texts, areas and scalar parameters recur all over the XMLs and, being immutable,
+# can be shared among all the objects that use them
+@lru_cache(maxsize=None)
+def _get_texts(category_path: str) -> TextsMixin | None:
     try:
-        path = origin.category_path
-        name = DISPLAYED_TEXTS[str(path)]
-        desc = DISPLAYED_TEXTS.get(f"{str(path)}Description")
-        flavor = DISPLAYED_TEXTS.get(f"{str(path)}Flavor")
-        return TextsMixin(name, desc, flavor)
+        name = DISPLAYED_TEXTS[category_path]
     except KeyError:
         return None
+    desc = DISPLAYED_TEXTS.get(f"{category_path}Description")
+    flavor = DISPLAYED_TEXTS.get(f"{category_path}Flavor")
+    return TextsMixin(name, desc, flavor)
+
+
+@lru_cache(maxsize=None)
+def _get_area(affects: str, radius: int | None, exclude_radius: int | None) -> Area:
+    return Area(affects, radius, exclude_radius)
+
+
+# never for references (Origins) as those get replaced in place during dereferencing
+@lru_cache(maxsize=None, typed=True)
+def _get_scalar_param(type_: str, value: str | int | float | bool) -> Parameter:
+    return Parameter(type_, value)
+
+
+# one comment-stripping parser shared by all files (parsing is single-threaded)
+_XML_PARSER = lxml.etree.XMLParser(remove_comments=True)
 
 
 class Xml(File):
+    SANITIZE_PATTERN = re.compile(r"(?<=value=\")<.*>(?=\")")
+
     @property
     def root(self) -> Element:
         return self._root
@@ -231,7 +265,7 @@ class Xml(File):
         self._texts = get_texts(self.origin)
         if self.file.suffix.lower() != ".xml":
             raise ValueError(f"not a XML file: '{self.file}'")
-        parser = lxml.etree.XMLParser(remove_comments=True)
+        parser = _XML_PARSER
         try:
             self._root: Element = lxml.etree.parse(self.file, parser).getroot()
         except XMLSyntaxError as e:
@@ -266,7 +300,7 @@ class Xml(File):
             return match.group().replace('<', '{').replace('>', '}')
 
         # use re.sub with a function as replacer
-        return re.sub(r"(?<=value=\")<.*>(?=\")", replace_brackets, line)
+        return Xml.SANITIZE_PATTERN.sub(replace_brackets, line)
 
 
 class XmlParser:
@@ -302,12 +336,23 @@ class XmlParser:
     def name(self) -> str | None:
         return self.texts.name if self.texts else None
 
-    def __init__(self, xml: PathLike | Element, context: dict[str, Data] = None) -> None:
+    def __init__(
+            self, xml: PathLike | Element, context: dict[str, Data] = None,
+            variants: dict[tuple, Data] = None) -> None:
         self._xml = Xml(xml) if not isinstance(xml, Element) else None
         self._root = self.xml.root if self.xml else xml
         self._context = context or {}
+        # upgrade-requiring traits and unit-specific weapons already derived during this parsing
+        # run (passing the same dict to all parsers of a run lets them share identical ones)
+        self._variants = {} if variants is None else variants
         self._validate_root_tag()
 
+    def get_variant(self, key: tuple, factory: Callable[[], T]) -> T:
+        variant = self._variants.get(key)
+        if variant is None:
+            variant = self._variants[key] = factory()
+        return variant
+
     def collect_tags(self, root: Element = None) -> list[str]:
         root = self.root if root is None else root
         return sorted({el.tag for el in root.iter(Element)})
@@ -340,7 +385,9 @@ class XmlParser:
             self, element: Element,
             parent_category: str = None,
             process_sub_effects=True) -> Effect | CategoryEffect:  # recursive
-        name = element.tag
+        # lxml hands out a fresh string on each access, interning collapses the few hundred
+        # distinct effect names (and parameter types below) used by thousands of objects
+        name = sys.intern(element.tag)
         category = CategoryEffect.get_category(name) or parent_category
         params = tuple(
             self.to_param(attr, value, category) for attr, value in (element.attrib.items()))
@@ -354,6 +401,7 @@ class XmlParser:
         return Effect(name, params, sub_effects)
 
     def to_param(self, attr: str, value: str, category: str | None) -> Parameter:
+        attr = sys.intern(attr)
         value_type = Parameter.TYPES.get(attr)
         value_type = value_type or str
         if attr == "name" and category:
@@ -380,7 +428,7 @@ class XmlParser:
             category = attr_category if attr_category else category
             return Parameter(attr, tuple(
                 self._get_context_value(Origin(Path(category) / v)) for v in value.split()))
-        return Parameter(attr, value_type(value))
+        return _get_scalar_param(attr, value_type(value))
 
     def parse_effects(
             self, parent_element: Element,
@@ -435,7 +483,7 @@ class XmlParser:
     def _parse_area(area_el: Element) -> Area:
         radius = area_el.attrib.get("radius")
         exclude_radius = area_el.attrib.get("excludeRadius")
-        return Area(
+        return _get_area(
             area_el.attrib["affects"],
             int(radius) if radius is not None else None,
             int(exclude_radius) if exclude_radius is not None else None
@@ -446,7 +494,7 @@ class XmlParser:
         if not reference:
             return None
         reference = Path(reference)
-        if not any(p in CATEGORIES for p in reference.parts):
+        if CATEGORIES_SET.isdisjoint(reference.parts):
             return None  # self-reference, e.g. in Traits/Missing.xml
         return self._get_context_value(Origin(reference))
 
@@ -467,7 +515,9 @@ class XmlParser:
             raise ValueError(f"trait not retrievable: {name!r}")
         required_upgrade = self.parse_required_upgrade(trait_el)
         if required_upgrade:
-            return Trait.with_upgrade(trait, required_upgrade)
+            return self.get_variant(
+                (name, str(required_upgrade.category_path)),
+                lambda: Trait.with_upgrade(trait, required_upgrade))
         return trait
 
     def parse_dlc(self) -> str | None:
@@ -514,7 +564,7 @@ class UpgradeParser(XmlParser):
 
     def __init__(self, file: PathLike) -> None:
         super().__init__(file)
-        if (self.xml.file.parent.name not in FACTIONS
+        if (self.xml.file.parent.name not in FACTIONS_SET
                 or self.xml.file.parent.parent.name != "Upgrades"):
             raise ValueError(f"invalid input file: {self.xml.file}")
         self._reference = self.parse_reference(self.root)
@@ -710,8 +760,10 @@ class WeaponParser(XmlParser):
         "SeekerMissile1": "SeekerMissile",
     }
 
-    def __init__(self, file: PathLike, context: dict[str, Data]) -> None:
-        super().__init__(file, context)
+    def __init__(
+            self, file: PathLike, context: dict[str, Data],
+            variants: dict[tuple, Data] = None) -> None:
+        super().__init__(file, context, variants)
         if self.xml.file.parent.name != "Weapons":
             raise ValueError(f"invalid input file: {self.xml.file}")
         self._reference = self.parse_reference(self.root)
@@ -763,7 +815,8 @@ def parse_weapons(
     _log.info("Parsing weapons...")
     context = {str(obj.category_path): obj for obj in [*upgrades, *traits]}
     rootdir = Path(r"xml/World/Weapons")
-    weapons = [WeaponParser(f, context).to_data() for f in rootdir.iterdir()]
+    variants = {}
+    weapons = [WeaponParser(f, context, variants).to_data() for f in rootdir.iterdir()]
     _log.info(f"Parsed {len(weapons)} weapons")
     resolved, unresolved = get_context(upgrades=[*upgrades], traits=[*traits], weapons=weapons)
     _, _, weapons, *_ = dereference(resolved, unresolved, "Units", "Buildings")
@@ -777,7 +830,7 @@ class _ActionSubParser(XmlParser):
     """
     @property
     def name(self) -> str:  # override
-        return self.root.tag
+        return sys.intern(self.root.tag)
 
     @property
     def texts(self) -> TextsMixin | None:  # override
@@ -862,8 +915,10 @@ class UnitParser(XmlParser):
     """
     ROOT_TAG = "unit"
 
-    def __init__(self, file: PathLike, context: dict[str, Data]) -> None:
-        super().__init__(file, context)
+    def __init__(
+            self, file: PathLike, context: dict[str, Data],
+            variants: dict[tuple, Data] = None) -> None:
+        super().__init__(file, context, variants)
         if (self.xml.file.parent.parent.name != "Units"
                 and self.xml.file.parent.parent.parent.name != "Units"):
             raise ValueError(f"invalid input file: {self.xml.file}")
@@ -894,8 +949,11 @@ class UnitParser(XmlParser):
             raise ValueError(f"weapon not retrievable: {name!r}")
         count = int(count) if count else 1
         enabled = True if not enabled else False
-        return Weapon.with_additional_data(
-            weapon, count, enabled, self.parse_required_upgrade(weapon_el))
+        required_upgrade = self.parse_required_upgrade(weapon_el)
+        key = (name, count, enabled,
+               str(required_upgrade.category_path) if required_upgrade else None)
+        return self.get_variant(
+            key, lambda: Weapon.with_additional_data(weapon, count, enabled, required_upgrade))
 
     def to_data(self) -> Unit:  # override
         return Unit(
@@ -921,7 +979,8 @@ def parse_units(
     _log.info("Parsing units...")
     context = {str(obj.category_path): obj for obj in [*upgrades, *traits, *weapons]}
     rootdir = Path(r"xml/World/Units")
-    units = [UnitParser(Path(dir_) / f, context).to_data() for dir_, _, files
+    variants = {}
+    units = [UnitParser(Path(dir_) / f, context, variants).to_data() for dir_, _, files
              in os.walk(rootdir) for f in files]
     _log.info(f"Parsed {len(units)} units")
     resolved, unresolved = get_context(
@@ -937,8 +996,10 @@ class BuildingParser(XmlParser):
     """
     ROOT_TAG = "building"
 
-    def __init__(self, file: PathLike, context: dict[str, Data]) -> None:
-        super().__init__(file, context)
+    def __init__(
+            self, file: PathLike, context: dict[str, Data],
+            variants: dict[tuple, Data] = None) -> None:
+        super().__init__(file, context, variants)
         if (self.xml.file.parent.parent.name != "Buildings"
                 and self.xml.file.parent.parent.parent.name != "Buildings"):
             raise ValueError(f"invalid input file: {self.xml.file}")
@@ -971,7 +1032,8 @@ def parse_buildings(
     _log.info("Parsing buildings...")
     context = {str(obj.category_path): obj for obj in [*upgrades, *traits, *weapons, *units]}
     rootdir = Path(r"xml/World/Buildings")
-    buildings = [BuildingParser(Path(dir_) / f, context).to_data() for dir_, _, files
+    variants = {}
+    buildings = [BuildingParser(Path(dir_) / f, context, variants).to_data() for dir_, _, files
                  in os.walk(rootdir) for f in files]
     _log.info(f"Parsed {len(buildings)} buildings")
     resolved, unresolved = get_context(
@@ -10,13 +10,12 @@
 import logging
 from datetime import datetime
 from functools import wraps
-from logging.handlers import RotatingFileHandler
 from pathlib import Path
 from typing import Callable, Iterable, Optional, Protocol, Sequence
 
 from contexttimer import Timer
 
-from gladiunits.constants import PathLike, T, SECONDS_IN_YEAR
+from gladiunits.constants import OUTPUT_DIR, PathLike, T, SECONDS_IN_YEAR
 from gladiunits.utils.check_type import type_checker
 
 
@@ -74,15 +73,22 @@ def getdir(path: PathLike, create_missing=True) -> Path:
     """Return a directory at ``path`` creating it (and all its needed parents) if missing.
     """
     dir_ = Path(path)
-    if not dir_.exists() and create_missing:
+    if dir_.is_dir():  # the common case settled with a single stat
+        return dir_
+    if dir_.is_file():
+        raise NotADirectoryError(f"not a directory: '{dir_.resolve()}'")
+    if create_missing:
         _log.warning(f"Creating missing directory at: '{dir_.resolve()}'...")
         dir_.mkdir(parents=True, exist_ok=True)
-    else:
-        if dir_.is_file():
-            raise NotADirectoryError(f"not a directory: '{dir_.resolve()}'")
     return dir_
 
 
+def ensure_output_dir() -> Path:
+    """Return the project's output directory creating it if missing.
+    """
+    return getdir(OUTPUT_DIR)
+
+
 @type_checker(PathLike)
 def getfile(path: PathLike, ext="") -> Path:
     """Return an existing file at ``path``.
@@ -111,6 +117,8 @@ def is_increasing(seq: Sequence[Comparable]) -> bool:
 def init_log() -> None:
     """Initialize logging.
     """
+    from logging.handlers import RotatingFileHandler  # only needed here, spare it on import
+
     output_dir = Path(__file__).parent.parent.parent / "temp" / "logs"
     if output_dir.exists():
         logfile = output_dir / "gladiunits.log"
@@ -0,0 +1,119 @@
+"""
+
+    tests.test_cache.py
+    ~~~~~~~~~~~~~~~~~~~
+    Test the on-disk cache of parsed data.
+
+    @author: z33k
+
+"""
+import os
+import pickle
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+from gladiunits import cache
+from gladiunits.data import (Action, Building, Effect, Modifier, ModifierType, Origin, Parameter,
+                             Trait, Unit, Upgrade, Weapon, WeaponType)
+
+
+def _parsed() -> cache.Parsed:
+    upgrade = Upgrade(
+        Path("xml/World/Upgrades/SpaceMarines/A.xml"), "A", None, None, None, 1, None)
+    armor = Effect("armor", (Parameter("base", 3.0),), ())
+    scout_ref = Effect("addUnit", (Parameter("unit", Origin(Path("Units/SpaceMarines/Scout"))),), ())
+    trait = Trait(
+        path=Path("xml/World/Traits/Vehicle.xml"), name="Vehicle", description=None,
+        flavor=None, reference=None, modifiers=(Modifier(None, ModifierType.REGULAR, (), (armor,)),),
+        type=None, target_conditions=(), max_rank=None, stacking=None, required_upgrade=upgrade)
+    weapon = Weapon(
+        path=Path("xml/World/Weapons/Bolter.xml"), name="Bolter", description=None, flavor=None,
+        reference=None, modifiers=(), traits=(trait,), required_upgrade=None,
+        type=WeaponType.PROJECTILE, target=None, count=None, enabled=None)
+    unit = Unit(
+        path=Path("xml/World/Units/SpaceMarines/Tactical.xml"), name="Tactical", description=None,
+        flavor=None, reference=None,
+        modifiers=(Modifier(None, ModifierType.REGULAR, (), (armor, scout_ref)),),
+        group_size=5, weapons=(weapon,), actions=(), traits=(trait,), required_upgrade=None,
+        dlc=None, producer=None)
+    produce = Action(
+        required_upgrade=None, modifiers=(), reference=None, name="produceUnit",
+        params=(Parameter("unit", unit),), texts=None, conditions=(), targets=(),
+        required_weapons=())
+    building = Building(
+        path=Path("xml/World/Buildings/SpaceMarines/Barracks.xml"), name="Barracks",
+        description=None, flavor=None, modifiers=(), actions=(produce,), traits=(),
+        required_upgrade=None)
+    # a reference cycle like the ones dereferencing leaves behind
+    object.__setattr__(unit, "producer", building)
+    return [upgrade], [trait], [weapon], [unit], [building]
+
+
+def test_parsed_data_survives_pickling():
+    parsed = _parsed()
+    loaded = pickle.loads(pickle.dumps(parsed, protocol=pickle.HIGHEST_PROTOCOL))
+    for objects, loaded_objects in zip(parsed, loaded):
+        for obj, loaded_obj in zip(objects, loaded_objects):
+            assert hash(loaded_obj) == hash(obj)
+            assert loaded_obj == obj
+            assert loaded_obj in {obj}
+            assert loaded_obj.category == obj.category
+            assert loaded_obj.unresolved_refs == obj.unresolved_refs
+    unit, building = loaded[3][0], loaded[4][0]
+    assert unit.producer is building
+    assert building.produced_units == [unit]
+    assert unit.unresolved_refs  # the Scout reference stays unresolved
+
+
+@pytest.fixture
+def xml_dir(tmp_path: Path) -> Path:
+    xml_dir = tmp_path / "xml"
+    xml_dir.mkdir()
+    (xml_dir / "a.xml").write_text("<a/>")
+    return xml_dir
+
+
+def test_signature_changes_with_xml_tree(xml_dir: Path):
+    signature = cache._signature(xml_dir)
+    assert cache._signature(xml_dir) == signature
+    file = xml_dir / "a.xml"
+    stat = file.stat()
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    touched = cache._signature(xml_dir)
+    assert touched != signature
+    (xml_dir / "b.xml").write_text("<b/>")
+    assert cache._signature(xml_dir) not in (signature, touched)
+
+
+def test_signature_changes_with_code(xml_dir: Path, monkeypatch: pytest.MonkeyPatch):
+    signature = cache._signature(xml_dir)
+    monkeypatch.setattr(cache, "CODE_MODULES", cache.CODE_MODULES[:-1])
+    assert cache._signature(xml_dir) != signature
+
+
+def test_load_all_reparses_on_new_signature(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    calls = []
+
+    def parse_all(sort=False) -> cache.Parsed:
+        calls.append(sort)
+        return _parsed()
+
+    monkeypatch.setitem(
+        sys.modules, "gladiunits.parse", types.SimpleNamespace(parse_all=parse_all))
+    monkeypatch.setattr(cache, "ensure_output_dir", lambda: tmp_path)
+    monkeypatch.setattr(cache, "_signature", lambda: "0123")
+    orphan = tmp_path / f"{cache.CACHE_PREFIX}{cache.TMP_PREFIX}x{cache.CACHE_SUFFIX}"
+    orphan.touch()  # as if left by a run killed mid-write
+
+    first = cache.load_all()
+    assert cache.load_all() == first
+    assert len(calls) == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["parsed_0123.pickle"]
+
+    monkeypatch.setattr(cache, "_signature", lambda: "4567")
+    cache.load_all()
+    assert len(calls) == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["parsed_4567.pickle"]